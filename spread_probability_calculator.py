@@ -16,20 +16,51 @@ Usage:
     python spread_probability_calculator.py --file1 data1.csv --file2 data2.csv --bootstrap-iter 5000
 """
 
-import argparse
+import math
 import sys
-import warnings
 import pandas as pd
 import numpy as np
+from bisect import bisect_left
 from pathlib import Path
 from scipy import stats
-from collections import Counter
 from dataclasses import dataclass
-from typing import Optional, Dict, Tuple, List
+from typing import TYPE_CHECKING, Optional, Dict, Tuple, List
+
+if TYPE_CHECKING:
+    import argparse
 
 # Required columns for each input CSV
 REQUIRED_COLUMNS = {'datetime', 'open', 'high', 'low', 'close', 'volume'}
 
+# Two-sided normal quantiles by confidence level; other levels filled on first use
+_Z_CACHE: Dict[float, float] = {
+    0.90: 1.6448536269514722,
+    0.95: 1.959963984540054,
+    0.99: 2.5758293035489004,
+}
+
+# Report layout rules
+BAR = '=' * 80
+RULE = '─' * 80
+HR = '─' * 60
+BOX_BOT = '└' + '─' * 62 + '┘'
+SUMMARY_RULE = '-' * 50
+
+# S/R presentation, indexed by band: proximity by distance (>5T, <=5T, <=2T)
+# and target action by strength (<4, >=4, >=7)
+PROXIMITY_LABELS = ("", " → Approaching", " ⚠️ TESTING")
+TARGET_ACTIONS = (
+    "Weak level at {price:.4f} ({dist}T away) - may break through",
+    "Moderate {type} at {price:.4f} ({dist}T away) - watch for reaction",
+    "Strong {type} at {price:.4f} ({dist}T away) - likely to hold",
+)
+
+# Support/resistance level type bits
+LEVEL_VOLUME = 1
+LEVEL_SWING_HIGH = 2
+LEVEL_SWING_LOW = 4
+LEVEL_TYPE_NAMES = ((LEVEL_VOLUME, 'Volume'), (LEVEL_SWING_HIGH, 'Swing High'), (LEVEL_SWING_LOW, 'Swing Low'))
+
 
 @dataclass
 class Config:
@@ -52,6 +83,110 @@ class Config:
     default_file2: Optional[str] = "DATA\SONH27-Z27_1D.csv"
 
 
+def _z_score(confidence: float) -> float:
+    """Two-sided standard normal quantile for a confidence level, cached."""
+    z = _Z_CACHE.get(confidence)
+    if z is None:
+        z = _Z_CACHE[confidence] = float(stats.norm.ppf(1 - (1 - confidence) / 2))
+    return z
+
+
+def read_price_csv(path: str) -> pd.DataFrame:
+    """Read only the required OHLCV columns of a price CSV.
+    
+    Column names are matched case-insensitively. Uses pandas' multithreaded pyarrow
+    engine when pyarrow is installed, otherwise the default C engine.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in header if str(c).strip().lower() in REQUIRED_COLUMNS]
+    try:
+        return pd.read_csv(path, engine='pyarrow', usecols=usecols)
+    except ImportError:
+        return pd.read_csv(path, usecols=usecols)
+
+
+def keep_last_per_date(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep the last row of each date_key run.
+    
+    Equivalent to drop_duplicates(subset=['date_key'], keep='last') when the frame
+    is sorted by datetime, but found with a sequential scan instead of hashing.
+    """
+    keys = df['date_key'].to_numpy()
+    if len(keys) == 0:
+        return df
+    last_idx = np.append(np.flatnonzero(keys[:-1] != keys[1:]), len(keys) - 1)
+    return df.iloc[last_idx]
+
+
+def count_runs(flags: np.ndarray) -> int:
+    """Number of runs (maximal blocks of equal values) in a boolean sequence."""
+    # Contiguous bytes (zero-copy view for bool arrays), no pandas index alignment
+    a = np.ascontiguousarray(flags)
+    if a.dtype == np.bool_:
+        a = a.view(np.uint8)
+    if a.size == 0:
+        return 0
+    return 1 + int(np.count_nonzero(a[1:] != a[:-1]))
+
+
+def _tick_prefix_sums(tick_move: np.ndarray, weights: Optional[np.ndarray] = None):
+    """Bin integer tick moves once and return below(k), the count (or weight sum) of moves < k.
+    
+    Tick moves are small integers, so a bincount over the shifted range plus a
+    cumulative sum answers every threshold query in O(1). below(None) is the total.
+    """
+    tick_move = np.asarray(tick_move, dtype=np.int64)
+    lo = int(tick_move.min()) if len(tick_move) else 0
+    bins = np.bincount(tick_move - lo, weights=weights)
+    cum = np.concatenate(([0], np.cumsum(bins)))
+    
+    def below(k: Optional[np.ndarray]) -> np.ndarray:
+        if k is None:
+            return cum[-1]
+        return cum[np.clip(np.asarray(k) - lo, 0, len(bins))]
+    
+    return below
+
+
+def count_tick_stats(tick_move: np.ndarray, thresholds: Tuple[int, ...]) -> np.ndarray:
+    """Count tick-move events for 0 and every threshold in one bincount pass.
+    
+    Returns an int64 array of shape (len(thresholds) + 1, 4); row 0 is the
+    zero-tick level, row i is thresholds[i - 1]. Columns are
+    [count_exact (|t| == n), count_at_least (|t| >= n), count_up (t >= n), count_down (t <= -n)].
+    """
+    below = _tick_prefix_sums(tick_move)
+    levels = np.array((0,) + tuple(thresholds), dtype=np.int64)
+    n = len(tick_move)
+    
+    counts = np.empty((len(levels), 4), dtype=np.int64)
+    counts[:, 2] = n - below(levels)
+    counts[:, 3] = below(1 - levels)
+    exact_up = below(levels + 1) - below(levels)
+    exact_down = below(1 - levels) - below(-levels)
+    counts[:, 0] = np.where(levels > 0, exact_up + exact_down, exact_up)
+    counts[:, 1] = np.where(levels > 0, counts[:, 2] + counts[:, 3], n)
+    return counts
+
+
+def sum_volume_tick_stats(tick_move: np.ndarray, volume: np.ndarray,
+                          thresholds: Tuple[int, ...]) -> np.ndarray:
+    """Sum volume over tick-move events for every threshold in one bincount pass.
+    
+    Returns an array of shape (len(thresholds), 3) with columns
+    [volume where |t| >= n, volume where t >= n, volume where t <= -n].
+    """
+    below = _tick_prefix_sums(tick_move, volume)
+    levels = np.asarray(thresholds, dtype=np.int64)
+    total = below(None)
+    
+    sums = np.empty((len(levels), 3))
+    sums[:, 1] = total - below(levels)
+    sums[:, 2] = below(1 - levels)
+    sums[:, 0] = np.where(levels > 0, sums[:, 1] + sums[:, 2], total)
+    return sums
+
+
 class SpreadCalculator:
     """
     Production-grade spread probability calculator with support/resistance.
@@ -72,11 +207,17 @@ class SpreadCalculator:
         self.df_raw: Optional[pd.DataFrame] = None
         self.df_valid: Optional[pd.DataFrame] = None
         self.results: Dict = {}
+        # NumPy views of the regime columns, cached once by load_and_merge
+        self._tick_move_raw: Optional[np.ndarray] = None
+        self._abs_move_raw: Optional[np.ndarray] = None
+        self._volume_raw: Optional[np.ndarray] = None
+        self._tick_move_valid: Optional[np.ndarray] = None
+        self._row_id_valid: Optional[np.ndarray] = None
     
     def load_and_merge(self, file1_path: str, file2_path: str) -> pd.DataFrame:
         """Load and merge data with schema validation and outlier detection."""
-        df1 = pd.read_csv(file1_path)
-        df2 = pd.read_csv(file2_path)
+        df1 = read_price_csv(file1_path)
+        df2 = read_price_csv(file2_path)
         
         # Normalize column names
         df1.columns = df1.columns.str.lower().str.strip()
@@ -92,11 +233,9 @@ class SpreadCalculator:
             print(f"❌ File 2 missing required columns: {missing2}")
             sys.exit(1)
         
-        print(f"\n{'='*80}")
-        print("DATA LOADING")
-        print(f"{'='*80}")
-        print(f"File 1: {Path(file1_path).name} ({len(df1)} records)")
-        print(f"File 2: {Path(file2_path).name} ({len(df2)} records)")
+        print(f"\n{BAR}\nDATA LOADING\n{BAR}\n"
+              f"File 1: {Path(file1_path).name} ({len(df1)} records)\n"
+              f"File 2: {Path(file2_path).name} ({len(df2)} records)")
         
         df1 = df1.rename(columns={
             'open': 'open1', 'high': 'high1', 'low': 'low1', 
@@ -119,8 +258,8 @@ class SpreadCalculator:
         
         # Deduplicate: keep='last' ensures we use the last timestamp of each day
         n1_orig, n2_orig = len(df1), len(df2)
-        df1 = df1.drop_duplicates(subset=['date_key'], keep='last')
-        df2 = df2.drop_duplicates(subset=['date_key'], keep='last')
+        df1 = keep_last_per_date(df1)
+        df2 = keep_last_per_date(df2)
         
         dups1, dups2 = n1_orig - len(df1), n2_orig - len(df2)
         if dups1 > 0 or dups2 > 0:
@@ -135,77 +274,107 @@ class SpreadCalculator:
         
         n1, n2 = len(df1), len(df2)
         
-        merged = pd.merge(
-            df1[['datetime', 'date_key', 'close1', 'volume1']],
-            df2[['date_key', 'close2', 'volume2']],
-            on='date_key', how='inner'
-        ).sort_values('datetime').reset_index(drop=True)
+        # Inner join on date_key: keys are unique and sorted after dedup, so a sorted
+        # intersection gives row positions in both frames without a hash join.
+        # Output follows date_key order, which is also datetime order.
+        _, idx1, idx2 = np.intersect1d(
+            df1['date_key'].to_numpy(), df2['date_key'].to_numpy(),
+            assume_unique=True, return_indices=True
+        )
+        merged = pd.concat([
+            df1[['datetime', 'date_key', 'close1', 'volume1']].iloc[idx1].reset_index(drop=True),
+            df2[['close2', 'volume2']].iloc[idx2].reset_index(drop=True),
+        ], axis=1)
         
         lost = max(n1, n2) - len(merged)
         if lost > 0:
             print(f"⚠️  {lost} records lost due to non-overlapping dates")
         
-        merged = merged.copy()
-        merged.loc[:, 'spread_close'] = merged['close1'] - merged['close2']
-        merged.loc[:, 'spread_volume'] = np.minimum(merged['volume1'], merged['volume2'])
-        merged.loc[:, 'price_change'] = merged['spread_close'].diff()
-        merged.loc[:, 'tick_move'] = (merged['price_change'] / self.config.tick_size).round().astype('Int64')
-        merged.loc[:, 'abs_tick_move'] = merged['tick_move'].abs()
-        merged.loc[:, 'days_gap'] = merged['datetime'].diff().dt.days
+        # Derive every column as a plain ndarray, then build the frame once below
+        tick_size = self.config.tick_size
+        spread_close = merged['close1'].to_numpy() - merged['close2'].to_numpy()
+        spread_volume = np.minimum(merged['volume1'].to_numpy(), merged['volume2'].to_numpy())
+        price_change = np.concatenate(([np.nan], np.diff(spread_close)))
+        # Plain int64 ticks; rows without a price change (first row, missing closes)
+        # hold 0 and are flagged by has_tick_move instead of a nullable Int64 mask
+        # tick_values keeps NaN for the MAD input; rounding and the int cast write
+        # into their outputs directly instead of allocating temporaries
+        has_tick_move = ~np.isnan(price_change)
+        tick_values = np.divide(price_change, tick_size)
+        np.round(tick_values, out=tick_values)
+        tick_move = np.zeros(len(tick_values), dtype=np.int64)
+        np.copyto(tick_move, tick_values, casting='unsafe', where=has_tick_move)
+        abs_tick_move = np.abs(tick_move)
+        days_gap = merged['datetime'].diff().dt.days.to_numpy(dtype=float)
         
         # MARKET-ONLY DATA LOGIC: Input has trading days only (no weekends/holidays rows)
         # Strict Mode: days_gap <= 3 (Fri->Mon = 3 days = normal weekend)
         #              days_gap = 4 means missing trading day (holiday) -> REJECT
         # Relaxed Mode: days_gap <= 5 (allows long weekends/bank holidays)
+        gap_days = np.nan_to_num(days_gap, nan=999)
         if self.config.strict_daily_only:
-            merged.loc[:, 'is_consecutive'] = (merged['days_gap'].fillna(999) <= 3)
+            is_consecutive = gap_days <= 3
             print("ℹ️  Strict Mode: Rejecting gaps > 3 days (Holidays/Data Holes)")
         else:
-            merged.loc[:, 'is_consecutive'] = (merged['days_gap'].fillna(999) <= 5)
+            is_consecutive = gap_days <= 5
             print("ℹ️  Relaxed Mode: Allowing gaps ≤5 days (Long Weekends)")
         
         # First row has no gap - mark as consecutive
-        merged.loc[merged.index[0], 'is_consecutive'] = True
-        
-        # Add stable row_id for adjacency checks (before any filtering)
-        merged['row_id'] = np.arange(len(merged))
+        is_consecutive[0] = True
         
         # Expanding-window MAD for outlier detection
-        tick_series = merged['tick_move'].astype(float)
         min_periods = self.config.min_expanding_window
         
-        rolling_median = tick_series.expanding(min_periods=min_periods).median()
-        rolling_mad = (tick_series - rolling_median).abs().expanding(min_periods=min_periods).median()
+        tick_series = pd.Series(tick_values)
+        rolling_median = tick_series.expanding(min_periods=min_periods).median().to_numpy()
+        rolling_mad = (tick_series - rolling_median).abs().expanding(min_periods=min_periods).median().to_numpy()
         rolling_mad_scaled = rolling_mad * 1.4826
         
         # Identify warm-up rows (where stats are NaN)
-        warm_up_mask = rolling_median.isna() | rolling_mad_scaled.isna()
-        n_warm_up = warm_up_mask.sum()
+        warm_up_mask = np.isnan(rolling_median) | np.isnan(rolling_mad_scaled)
+        n_warm_up = int(warm_up_mask.sum())
         
         # Calculate outliers on FULL dataframe (warm-up rows will be marked as non-outlier)
         rolling_threshold = self.config.outlier_mad_threshold * np.maximum(
-            rolling_mad_scaled.fillna(self.config.min_outlier_ticks), 
+            np.nan_to_num(rolling_mad_scaled, nan=self.config.min_outlier_ticks), 
             self.config.min_outlier_ticks
         )
         
-        merged.loc[:, 'is_outlier'] = (
-            merged['tick_move'].isna() | 
-            (np.abs(tick_series - rolling_median) > rolling_threshold)
-        )
+        is_outlier = ~has_tick_move | (np.abs(tick_values - rolling_median) > rolling_threshold)
         # Warm-up rows are NOT outliers (we have no stats to judge them)
-        merged.loc[warm_up_mask, 'is_outlier'] = False
-        merged.loc[:, 'is_warmup'] = warm_up_mask
-        
-        n_outliers = merged['is_outlier'].sum()
+        is_outlier &= ~warm_up_mask
+        
+        merged = pd.DataFrame({
+            'datetime': merged['datetime'],
+            'date_key': merged['date_key'],
+            'close1': merged['close1'],
+            'volume1': merged['volume1'],
+            'close2': merged['close2'],
+            'volume2': merged['volume2'],
+            'spread_close': spread_close,
+            'spread_volume': spread_volume,
+            'price_change': price_change,
+            'has_tick_move': has_tick_move,
+            'tick_move': tick_move,
+            'abs_tick_move': abs_tick_move,
+            'days_gap': days_gap,
+            'is_consecutive': is_consecutive,
+            # Stable row_id for adjacency checks (before any filtering)
+            'row_id': np.arange(len(merged)),
+            'is_outlier': is_outlier,
+            'is_warmup': warm_up_mask,
+        }, copy=False)
+        
+        n_outliers = int(is_outlier.sum())
         if n_outliers > 0:
-            final_threshold = rolling_threshold.iloc[-1] if len(rolling_threshold) > 0 else self.config.min_outlier_ticks
+            final_threshold = rolling_threshold[-1] if len(rolling_threshold) > 0 else self.config.min_outlier_ticks
             print(f"⚠️  {n_outliers} outliers flagged (expanding MAD, threshold: {final_threshold:.1f} ticks)")
         
         if n_warm_up > 0:
             print(f"⚠️  {n_warm_up} warm-up rows (excluded from filtered stats, included in raw)")
         
         # Gap logging
-        n_gaps = ((~merged['is_consecutive']) & merged['tick_move'].notna()).sum()
+        n_gaps = int((~is_consecutive & has_tick_move).sum())
         max_gap = 3 if self.config.strict_daily_only else 5
         if n_gaps > 0:
             print(f"⚠️  {n_gaps} gaps >{max_gap} days excluded")
@@ -218,16 +387,24 @@ class SpreadCalculator:
         # df_raw: ALL consecutive rows INCLUDING outliers AND warm-up (Real World view)
         self.df_raw = merged[
             merged['is_consecutive'] & 
-            merged['tick_move'].notna()
-        ].copy()
+            merged['has_tick_move']
+        ]
         
         # df_valid: Filtered data EXCLUDING outliers AND warm-up (Normal Regime view)
         self.df_valid = merged[
             ~merged['is_outlier'] & 
             ~merged['is_warmup'] &
             merged['is_consecutive'] & 
-            merged['tick_move'].notna()
-        ].copy()
+            merged['has_tick_move']
+        ]
+        
+        # Cache plain ndarrays so the analysis methods don't repeat the same
+        # column conversions
+        self._tick_move_raw = self.df_raw['tick_move'].to_numpy()
+        self._abs_move_raw = self.df_raw['abs_tick_move'].to_numpy()
+        self._volume_raw = self.df_raw['spread_volume'].fillna(0).to_numpy()
+        self._tick_move_valid = self.df_valid['tick_move'].to_numpy()
+        self._row_id_valid = self.df_valid['row_id'].to_numpy()
         
         self.results['n_valid'] = len(self.df_valid)
         self.results['n_raw'] = len(self.df_raw)
@@ -246,49 +423,46 @@ class SpreadCalculator:
         """Return raw DataFrame (Real World - includes outliers)."""
         return self.df_raw
     
-    def _compute_probs_for_dataset(self, data: pd.DataFrame, label: str) -> Dict:
-        """Compute probabilities for a given dataset."""
-        n = len(data)
+    def _compute_probs_for_dataset(self, tick_moves: np.ndarray, label: str) -> Dict:
+        """Compute probabilities for a given dataset's tick moves."""
+        n = len(tick_moves)
         if n == 0:
             return {}
         
         results = {}
+        counts = count_tick_stats(tick_moves, self.config.tick_levels)
+        # Wilson CIs for every count at once: shape (levels, 4, 2)
+        cis = self._wilson_ci_vec(counts, n)
+        
+        def ci(row: int, col: int) -> Tuple[float, float]:
+            return (float(cis[row, col, 0]), float(cis[row, col, 1]))
         
         # Zero-tick
-        zero_mask = data['tick_move'] == 0
-        count_zero = zero_mask.sum()
+        count_zero = counts[0, 0]
         results[0] = {
             'tick_value': 0,
             'count_exact': int(count_zero),
             'prob_exact': count_zero / n,
-            'prob_exact_ci': self._wilson_ci(count_zero, n),
+            'prob_exact_ci': ci(0, 0),
         }
         
-        for nticks in self.config.tick_levels:
-            exact_mask = data['abs_tick_move'] == nticks
-            at_least_mask = data['abs_tick_move'] >= nticks
-            up_mask = data['tick_move'] >= nticks
-            down_mask = data['tick_move'] <= -nticks
-            
-            count_exact = exact_mask.sum()
-            count_at_least = at_least_mask.sum()
-            count_up = up_mask.sum()
-            count_down = down_mask.sum()
+        for row, nticks in enumerate(self.config.tick_levels, 1):
+            count_exact, count_at_least, count_up, count_down = counts[row]
             
             results[nticks] = {
                 'tick_value': nticks * self.config.tick_size,
                 'count_exact': int(count_exact),
                 'prob_exact': count_exact / n,
-                'prob_exact_ci': self._wilson_ci(count_exact, n),
+                'prob_exact_ci': ci(row, 0),
                 'count_at_least': int(count_at_least),
                 'prob_at_least': count_at_least / n,
-                'prob_at_least_ci': self._wilson_ci(count_at_least, n),
+                'prob_at_least_ci': ci(row, 1),
                 'count_up': int(count_up),
                 'prob_up_at_least': count_up / n,
-                'prob_up_ci': self._wilson_ci(count_up, n),
+                'prob_up_ci': ci(row, 2),
                 'count_down': int(count_down),
                 'prob_down_at_least': count_down / n,
-                'prob_down_ci': self._wilson_ci(count_down, n),
+                'prob_down_ci': ci(row, 3),
             }
         
         return {'n': n, 'label': label, 'probs': results}
@@ -300,17 +474,24 @@ class SpreadCalculator:
         - 'raw': Real World (Including Spikes) - uses all consecutive rows
         - 'filtered': Normal Regime - excludes MAD outliers
         """
-        raw_data = self._get_raw_moves()
-        filtered_data = self._get_valid_moves()
-        
-        raw_results = self._compute_probs_for_dataset(raw_data, "Real World (Inc. Spikes)")
-        filtered_results = self._compute_probs_for_dataset(filtered_data, "Normal Regime")
+        raw_results = self._compute_probs_for_dataset(self._tick_move_raw, "Real World (Inc. Spikes)")
+        filtered_results = self._compute_probs_for_dataset(self._tick_move_valid, "Normal Regime")
         
         # Store both for display
         self.results['empirical_raw'] = raw_results
         self.results['empirical'] = filtered_results.get('probs', {})  # Backward compat
         self.results['empirical_filtered'] = filtered_results
         
+        # Filtered ladder as parallel arrays (tick_levels order) for the summary table
+        probs = filtered_results.get('probs', {})
+        levels = [n for n in self.config.tick_levels if n in probs]
+        self.results['empirical_arr'] = {
+            'levels': np.asarray(levels),
+            'p_ge': np.array([probs[n]['prob_at_least'] for n in levels]),
+            'p_up': np.array([probs[n]['prob_up_at_least'] for n in levels]),
+            'p_dn': np.array([probs[n]['prob_down_at_least'] for n in levels]),
+        }
+        
         return {'raw': raw_results, 'filtered': filtered_results}
     
     def calculate_volume_weighted(self) -> Dict:
@@ -321,21 +502,17 @@ class SpreadCalculator:
         would hide tail risk.
         """
         # FIXED: Use raw data to include high-volume outlier events
-        raw = self._get_raw_moves()
-        total_vol = raw['spread_volume'].sum()
+        volume = self._volume_raw
+        total_vol = volume.sum()
         
         if total_vol == 0:
             return {}
         
+        sums = sum_volume_tick_stats(self._tick_move_raw, volume, self.config.tick_levels)
+        
         results = {}
-        for nticks in self.config.tick_levels:
-            at_least_mask = raw['abs_tick_move'] >= nticks
-            up_mask = raw['tick_move'] >= nticks
-            down_mask = raw['tick_move'] <= -nticks
-            
-            vol_at_least = raw.loc[at_least_mask, 'spread_volume'].sum()
-            vol_up = raw.loc[up_mask, 'spread_volume'].sum()
-            vol_down = raw.loc[down_mask, 'spread_volume'].sum()
+        for row, nticks in enumerate(self.config.tick_levels):
+            vol_at_least, vol_up, vol_down = sums[row]
             
             results[nticks] = {
                 'vol_weighted_at_least': vol_at_least / total_vol,
@@ -347,48 +524,49 @@ class SpreadCalculator:
         return results
     
     def calculate_bootstrap(self, n_iter: Optional[int] = None) -> Dict:
-        """Bootstrap confidence intervals - VECTORIZED for 100x speedup.
+        """Bootstrap confidence intervals via direct Binomial resampling of counts.
         
         WARNING: IID Assumption
         This bootstrap uses random sampling which assumes IID (independent, identically
         distributed) observations. Financial time series often exhibit serial correlation.
         The confidence intervals may underestimate true uncertainty. For production use,
         consider block bootstrap methods that preserve autocorrelation structure.
+        
+        n_iter=0 skips sampling and returns the exact Binomial(n, p_hat) percentiles.
         """
         if n_iter is None:
             n_iter = self.config.bootstrap_iterations
         
-        valid = self._get_valid_moves()
-        n = len(valid)
+        tick_moves = self._tick_move_valid
+        n = len(tick_moves)
         
         if n == 0:
             return {}
         
-        tick_moves = valid['tick_move'].values.astype(float)
-        abs_moves = valid['abs_tick_move'].values.astype(float)
-        
         # Use configurable RNG seed (None = random for production, set int for reproducibility)
         rng = np.random.default_rng(self.config.bootstrap_seed)
-        results = {}
+        levels = self.config.tick_levels
         
-        # VECTORIZED: Generate all bootstrap indices at once (n_samples, n_iter)
+        # Each statistic is a count of rows meeting a fixed predicate, so under IID
+        # resampling the bootstrap count is exactly Binomial(n, p_hat). All levels and
+        # directions are drawn in one call, shape (levels, [abs, up, down], n_iter).
+        # With n_iter == 0 the quantiles of that Binomial are taken in closed form.
         # NOTE: IID sampling - may underestimate CI width if data has autocorrelation
-        boot_indices = rng.choice(n, size=(n, n_iter), replace=True)
-        
-        # Use advanced indexing to get all bootstrap samples
-        boot_abs_samples = abs_moves[boot_indices]  # Shape: (n, n_iter)
-        boot_dir_samples = tick_moves[boot_indices]  # Shape: (n, n_iter)
+        p_hat = count_tick_stats(tick_moves, levels)[1:, 1:] / n
+        if n_iter == 0:
+            means = p_hat
+            ci = stats.binom.ppf([[[0.025]], [[0.975]]], n, p_hat) / n
+        else:
+            boot = rng.binomial(n, p_hat[..., None], size=p_hat.shape + (n_iter,)) / n
+            means = boot.mean(axis=-1)
+            ci = np.quantile(boot, [0.025, 0.975], axis=-1)
         
-        for nticks in self.config.tick_levels:
-            # Vectorized: compute means across samples (axis=0)
-            boot_abs = np.sum(boot_abs_samples >= nticks, axis=0) / n
-            boot_up = np.sum(boot_dir_samples >= nticks, axis=0) / n
-            boot_down = np.sum(boot_dir_samples <= -nticks, axis=0) / n
-            
+        results = {}
+        for i, nticks in enumerate(levels):
             results[nticks] = {
-                'abs': {'mean': float(np.mean(boot_abs)), 'ci': (float(np.percentile(boot_abs, 2.5)), float(np.percentile(boot_abs, 97.5)))},
-                'up': {'mean': float(np.mean(boot_up)), 'ci': (float(np.percentile(boot_up, 2.5)), float(np.percentile(boot_up, 97.5)))},
-                'down': {'mean': float(np.mean(boot_down)), 'ci': (float(np.percentile(boot_down, 2.5)), float(np.percentile(boot_down, 97.5)))},
+                key: {'mean': float(means[i, j]),
+                      'ci': (float(ci[0, i, j]), float(ci[1, i, j]))}
+                for j, key in enumerate(('abs', 'up', 'down'))
             }
         
         self.results['bootstrap'] = results
@@ -396,40 +574,37 @@ class SpreadCalculator:
     
     def calculate_conditional(self) -> Dict:
         """Calculate conditional probabilities using row_id for robust adjacency."""
-        valid = self._get_valid_moves().copy()
+        tick_moves = self._tick_move_valid
         
         # Use row_id (stable integer index) instead of pandas index for adjacency
-        valid.loc[:, 'next_tick'] = valid['tick_move'].shift(-1)
-        valid.loc[:, 'next_row_id'] = valid['row_id'].shift(-1)
-        
         # Valid transition: next row is adjacent in original DataFrame
-        valid.loc[:, 'valid_transition'] = (valid['next_row_id'] - valid['row_id']) == 1
-        
-        transitions = valid[valid['valid_transition'] & valid['next_tick'].notna()]
+        valid_transition = np.diff(self._row_id_valid) == 1
+        cur_tick = tick_moves[:-1][valid_transition]
+        next_tick = tick_moves[1:][valid_transition]
         
         min_samples = self.config.min_conditional_samples
         results = {}
         
         # After UP move
-        up_trans = transitions[transitions['tick_move'] > 0]
-        if len(up_trans) >= min_samples:
+        up_next = next_tick[cur_tick > 0]
+        if len(up_next) >= min_samples:
             results['after_up_move'] = {
-                'n_samples': len(up_trans),
-                'prob_continue_up': (up_trans['next_tick'] > 0).mean(),
-                'prob_reverse_down': (up_trans['next_tick'] < 0).mean(),
-                'prob_unchanged': (up_trans['next_tick'] == 0).mean(),
-                'avg_next_move': up_trans['next_tick'].mean(),
+                'n_samples': len(up_next),
+                'prob_continue_up': np.mean(up_next > 0),
+                'prob_reverse_down': np.mean(up_next < 0),
+                'prob_unchanged': np.mean(up_next == 0),
+                'avg_next_move': np.mean(up_next),
             }
         
         # After DOWN move
-        down_trans = transitions[transitions['tick_move'] < 0]
-        if len(down_trans) >= min_samples:
+        down_next = next_tick[cur_tick < 0]
+        if len(down_next) >= min_samples:
             results['after_down_move'] = {
-                'n_samples': len(down_trans),
-                'prob_continue_down': (down_trans['next_tick'] < 0).mean(),
-                'prob_reverse_up': (down_trans['next_tick'] > 0).mean(),
-                'prob_unchanged': (down_trans['next_tick'] == 0).mean(),
-                'avg_next_move': down_trans['next_tick'].mean(),
+                'n_samples': len(down_next),
+                'prob_continue_down': np.mean(down_next < 0),
+                'prob_reverse_up': np.mean(down_next > 0),
+                'prob_unchanged': np.mean(down_next == 0),
+                'avg_next_move': np.mean(down_next),
             }
         
         self.results['conditional'] = results
@@ -445,16 +620,16 @@ class SpreadCalculator:
         """
         # pd.Timedelta is already available from top-level import
         
-        df_full = self.df.copy()
+        df_full = self.df
         tick_size = self.config.tick_size
         
         # RECENCY FILTER: Only use recent data for S/R (avoids historical hangovers)
         lookback_days = self.config.sr_lookback_days
         cutoff_date = df_full['datetime'].max() - pd.Timedelta(days=lookback_days)
-        df = df_full[df_full['datetime'] >= cutoff_date].copy()
+        df = df_full[df_full['datetime'] >= cutoff_date]
         
         if len(df) < 10:
-            df = df_full.copy()  # Fallback if too little data
+            df = df_full  # Fallback if too little data
             lookback_days = (df_full['datetime'].max() - df_full['datetime'].min()).days
         
         current_price = df_full['spread_close'].iloc[-1]  # Always use latest
@@ -463,109 +638,109 @@ class SpreadCalculator:
         min_distance_ticks = self.config.sr_min_distance_ticks
         
         # INTEGER-BASED INDEXING
-        df['tick_idx'] = (df['spread_close'] / tick_size).round().astype(int)
-        
-        # Touch counts and volume (recent data only)
-        touch_counts = df['tick_idx'].value_counts().to_dict()
-        volume_by_tick = df.groupby('tick_idx')['spread_volume'].sum()
-        max_volume = volume_by_tick.max() if len(volume_by_tick) > 0 else 1
+        tick_idx = np.round(df['spread_close'].to_numpy() / tick_size).astype(int)
         
         # Detect swings
         # WARNING: center=True uses future data. Valid for static S/R levels display,
         # but INVALID for backtesting. Do not copy this logic into a trading system.
+        # Centered fixed-size windows via a strided view (same alignment as
+        # rolling(window, center=True); edge rows without a full window are never swings)
         window = self.config.swing_window
-        rolling_max = df['tick_idx'].rolling(window, center=True).max()
-        rolling_min = df['tick_idx'].rolling(window, center=True).min()
-        
-        df['is_swing_high'] = df['tick_idx'] == rolling_max
-        df['is_swing_low'] = df['tick_idx'] == rolling_min
-        
-        # Build levels using INTEGER keys (prevents float drift)
-        all_levels: Dict[int, Dict] = {}
-        
-        # Helper to init/merge level
-        def get_or_create(tick_idx: int) -> Dict:
-            if tick_idx not in all_levels:
-                all_levels[tick_idx] = {
-                    'tick_idx': tick_idx,
-                    'price': tick_idx * tick_size,
-                    'types': set(),
-                    'volume': 0,
-                    'touches': touch_counts.get(tick_idx, 0),
-                    'swing_count': 0
-                }
-            return all_levels[tick_idx]
-        
-        # Add volume nodes (merge, don't overwrite)
-        for tick_idx, vol in volume_by_tick.nlargest(self.config.top_n_levels * 6).items():
-            lv = get_or_create(tick_idx)
-            lv['types'].add('Volume')
-            lv['volume'] += vol  # Accumulate, not overwrite
-        
-        # OPTIMIZED: Vectorized swing detection using value_counts instead of iterrows
-        swing_high_counts = df.loc[df['is_swing_high'], 'tick_idx'].value_counts()
-        for tick_idx, count in swing_high_counts.items():
-            lv = get_or_create(tick_idx)
-            lv['types'].add('Swing High')
-            lv['swing_count'] += count
-        
-        swing_low_counts = df.loc[df['is_swing_low'], 'tick_idx'].value_counts()
-        for tick_idx, count in swing_low_counts.items():
-            lv = get_or_create(tick_idx)
-            lv['types'].add('Swing Low')
-            lv['swing_count'] += count
+        is_swing_high = np.zeros(len(tick_idx), dtype=bool)
+        is_swing_low = np.zeros(len(tick_idx), dtype=bool)
+        if len(tick_idx) >= window:
+            windows = np.lib.stride_tricks.sliding_window_view(tick_idx, window)
+            centre = slice(window // 2, window // 2 + len(windows))
+            is_swing_high[centre] = tick_idx[centre] == windows.max(axis=1)
+            is_swing_low[centre] = tick_idx[centre] == windows.min(axis=1)
+        
+        # Build levels as SoA arrays indexed by (tick_idx - tick_min): INTEGER keys
+        # prevent float drift, and every per-level quantity is a contiguous array
+        tick_min = int(tick_idx.min())
+        cells = tick_idx - tick_min
+        n_cells = int(cells.max()) + 1
+        
+        # Touch counts and volume (recent data only)
+        touches = np.bincount(cells, minlength=n_cells)
+        spread_volume = df['spread_volume'].to_numpy()
+        volume_by_tick = np.bincount(
+            cells, weights=np.nan_to_num(spread_volume), minlength=n_cells
+        ).astype(spread_volume.dtype, copy=False)
+        max_volume = volume_by_tick.max()
+        
+        # Level types as a bitmask per cell
+        types = np.zeros(n_cells, dtype=np.uint8)
+        volume = np.zeros_like(volume_by_tick)
+        
+        # Volume nodes: highest-volume traded ticks, selected with a partition rather
+        # than a full sort (ties at the cut-off -> lower tick, as nlargest)
+        traded = np.flatnonzero(touches > 0)
+        top_k = self.config.top_n_levels * 6
+        if len(traded) <= top_k:
+            volume_nodes = traded
+        elif top_k <= 0:
+            volume_nodes = traded[:0]
+        else:
+            traded_volume = volume_by_tick[traded]
+            cutoff = np.partition(traded_volume, len(traded) - top_k)[len(traded) - top_k]
+            above = traded_volume > cutoff
+            at_cutoff = np.flatnonzero(traded_volume == cutoff)[:top_k - int(above.sum())]
+            volume_nodes = np.concatenate((traded[above], traded[at_cutoff]))
+        types[volume_nodes] |= LEVEL_VOLUME
+        volume[volume_nodes] = volume_by_tick[volume_nodes]
+        
+        swing_high_counts = np.bincount(cells[is_swing_high], minlength=n_cells)
+        swing_low_counts = np.bincount(cells[is_swing_low], minlength=n_cells)
+        types[swing_high_counts > 0] |= LEVEL_SWING_HIGH
+        types[swing_low_counts > 0] |= LEVEL_SWING_LOW
+        swing_count = swing_high_counts + swing_low_counts
         
         # Strength score with CONFLUENCE BOOST
-        def calc_strength(level: Dict) -> float:
-            score = 0
-            types = level['types']
-            
-            # Base confluence (up to 3 pts)
-            score += min(len(types), 3)
-            
-            # CONFLUENCE BOOST: Volume + Swing = massive signal (+3)
-            has_volume = 'Volume' in types
-            has_swing = 'Swing High' in types or 'Swing Low' in types
-            if has_volume and has_swing:
-                score += 3
-            
-            # Volume score (up to 3 pts)
-            if max_volume > 0:
-                score += (level['volume'] / max_volume) * 3
-            
-            # Touch count (up to 2 pts)
-            score += min(level['touches'] / 10, 1) * 2
-            
-            # Swing count (up to 2 pts)
-            score += min(level['swing_count'] / 3, 1) * 2
-            
-            return min(round(score, 1), 10)
+        has_volume = (types & LEVEL_VOLUME) > 0
+        has_swing = (types & (LEVEL_SWING_HIGH | LEVEL_SWING_LOW)) > 0
+        n_types = (
+            has_volume.astype(np.int64)
+            + ((types & LEVEL_SWING_HIGH) > 0)
+            + ((types & LEVEL_SWING_LOW) > 0)
+        )
+        # Base confluence (up to 3 pts) + Volume + Swing = massive signal (+3)
+        score = np.minimum(n_types, 3) + 3 * (has_volume & has_swing)
+        # Volume score (up to 3 pts)
+        if max_volume > 0:
+            score = score + (volume / max_volume) * 3
+        # Touch count (up to 2 pts) and swing count (up to 2 pts)
+        score = score + np.minimum(touches / 10, 1) * 2
+        score = score + np.minimum(swing_count / 3, 1) * 2
+        strength = np.minimum(np.round(score, 1), 10)
+        
+        prices = (np.arange(n_cells) + tick_min) * tick_size
         
         # Process levels
         processed = []
-        for price_key, level in all_levels.items():
-            dist = abs(level['price'] - current_price)
+        for cell in np.flatnonzero(types):
+            price = prices[cell]
+            dist = abs(price - current_price)
             dist_ticks = int(round(dist / tick_size))
             
             # Skip current price
             if dist_ticks == 0:
                 continue
             
-            strength = calc_strength(level)
+            level_types = [name for bit, name in LEVEL_TYPE_NAMES if types[cell] & bit]
             
             # PURE DATA: No English commentary - just raw numbers
             # Text formatting moved to print_results
             processed.append({
-                'price': level['price'],
-                'type': ' + '.join(sorted(level['types'])),
-                'types': list(level['types']),
-                'strength': strength,
-                'touches': level['touches'],
-                'swing_count': level['swing_count'],
-                'volume': level['volume'],
+                'price': price,
+                'type': ' + '.join(sorted(level_types)),
+                'types': level_types,
+                'strength': strength[cell],
+                'touches': int(touches[cell]),
+                'swing_count': int(swing_count[cell]),
+                'volume': volume[cell],
                 'distance': dist,
                 'distance_ticks': dist_ticks,  # Raw proximity in ticks
-                'is_resistance': level['price'] > current_price
+                'is_resistance': price > current_price
             })
         
         # Separate and filter
@@ -579,12 +754,19 @@ class SpreadCalculator:
         # Apply minimum distance filter (tick-based)
         def filter_levels(levels: List[Dict], min_dist_ticks: int, max_n: int) -> List[Dict]:
             accepted = []
+            accepted_prices: List[float] = []  # kept sorted; only nearest neighbours need checking
+            min_dist = min_dist_ticks * tick_size
             for lv in levels:
-                # Simple price-based check (avoids redundancy)
-                if all(abs(lv['price'] - a['price']) >= min_dist_ticks * tick_size for a in accepted):
-                    accepted.append(lv)
-                    if len(accepted) >= max_n:
-                        break
+                price = lv['price']
+                idx = bisect_left(accepted_prices, price)
+                if idx > 0 and abs(price - accepted_prices[idx - 1]) < min_dist:
+                    continue
+                if idx < len(accepted_prices) and abs(price - accepted_prices[idx]) < min_dist:
+                    continue
+                accepted.append(lv)
+                accepted_prices.insert(idx, price)
+                if len(accepted) >= max_n:
+                    break
             return sorted(accepted, key=lambda x: x['distance'])
         
         resistance = filter_levels(resistance_all, min_distance_ticks, self.config.top_n_levels)
@@ -626,9 +808,8 @@ class SpreadCalculator:
         Filtering out outliers would hide momentum effects.
         """
         # FIXED: Use raw data for stats - need to see actual volatility clustering
-        raw = self._get_raw_moves()
-        tick_moves = raw['tick_move'].values.astype(float)
-        abs_moves = raw['abs_tick_move'].values.astype(float)
+        tick_moves = self._tick_move_raw
+        abs_moves = self._abs_move_raw
         
         if len(tick_moves) < 10:
             return {}
@@ -655,22 +836,25 @@ class SpreadCalculator:
             'is_flatline': std_dir == 0,
         }
         
-        # Autocorrelation with NaN handling and flatline safety
+        # Autocorrelation (Pearson r of x[:-lag] vs x[lag:]) from shared prefix sums:
+        # each lag costs one dot product. Exact integer sums keep the flatline check exact.
+        csum = np.concatenate(([0], np.cumsum(tick_moves)))
+        csum_sq = np.concatenate(([0], np.cumsum(tick_moves * tick_moves)))
+        n_ticks = len(tick_moves)
+        
         autocorr = {}
         for lag in [1, 2, 3, 5]:
-            if len(tick_moves) > lag:
-                slice1, slice2 = tick_moves[:-lag], tick_moves[lag:]
-                # SAFETY: Check for zero variance before calling corrcoef
-                if np.std(slice1) == 0 or np.std(slice2) == 0:
+            if n_ticks > lag:
+                m = n_ticks - lag
+                sum1, sum2 = int(csum[m]), int(csum[-1] - csum[lag])
+                var1 = m * int(csum_sq[m]) - sum1 * sum1
+                var2 = m * int(csum_sq[-1] - csum_sq[lag]) - sum2 * sum2
+                # SAFETY: zero variance in either slice means correlation is undefined
+                if var1 == 0 or var2 == 0:
                     autocorr[f'lag_{lag}'] = None
                 else:
-                    try:
-                        with warnings.catch_warnings():
-                            warnings.simplefilter("ignore", RuntimeWarning)
-                            corr_val = np.corrcoef(slice1, slice2)[0, 1]
-                        autocorr[f'lag_{lag}'] = corr_val if np.isfinite(corr_val) else None
-                    except Exception:
-                        autocorr[f'lag_{lag}'] = None
+                    cov = m * int(tick_moves[:-lag] @ tick_moves[lag:]) - sum1 * sum2
+                    autocorr[f'lag_{lag}'] = cov / math.sqrt(var1 * var2)
         
         t_stat, t_pval = stats.ttest_1samp(tick_moves, 0)
         
@@ -687,19 +871,22 @@ class SpreadCalculator:
         # Runs test with edge case handling
         median = np.median(tick_moves)
         above = tick_moves > median
-        n_above, n_below = np.sum(above), len(above) - np.sum(above)
+        n_above = int(np.count_nonzero(above))
+        n_below = len(above) - n_above
         
         if n_above == 0 or n_below == 0:
             # Flat series - runs test not applicable
             z_runs, is_random = None, None
             runs_note = "not applicable (flat series)"
         else:
-            runs = 1 + np.sum(above[1:] != above[:-1])
-            exp_runs = 1 + (2 * n_above * n_below) / (n_above + n_below)
-            var_runs = (2 * n_above * n_below * (2 * n_above * n_below - n_above - n_below)) / \
-                       ((n_above + n_below)**2 * (n_above + n_below - 1))
-            z_runs = (runs - exp_runs) / np.sqrt(max(var_runs, 1e-9))
-            is_random = abs(z_runs) < 1.96
+            runs = count_runs(above)
+            # Wald-Wolfowitz moments; Python ints keep the products exact
+            m = 2 * n_above * n_below
+            n_total = n_above + n_below
+            exp_runs = 1 + m / n_total
+            var_runs = m * (m - n_total) / (n_total * n_total * (n_total - 1))
+            z_runs = (runs - exp_runs) / math.sqrt(var_runs if var_runs > 1e-9 else 1e-9)
+            is_random = -1.96 < z_runs < 1.96
             runs_note = None
         
         results = {
@@ -716,14 +903,29 @@ class SpreadCalculator:
     @staticmethod
     def _wilson_ci(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
         """Wilson score confidence interval."""
-        if trials == 0:
-            return (0.0, 0.0)
-        z = stats.norm.ppf(1 - (1 - confidence) / 2)
-        p = successes / trials
-        denom = 1 + z**2 / trials
-        center = (p + z**2 / (2 * trials)) / denom
-        margin = (z / denom) * np.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2))
-        return (max(0, center - margin), min(1, center + margin))
+        lo, hi = SpreadCalculator._wilson_ci_vec(successes, trials, confidence)
+        return (float(lo), float(hi))
+    
+    @staticmethod
+    def _wilson_ci_vec(successes, trials, confidence: float = 0.95) -> np.ndarray:
+        """Wilson score confidence intervals over arrays of successes and trials.
+        
+        Inputs broadcast against each other; returns an array of shape
+        broadcast_shape + (2,) holding (lower, upper). Zero trials give (0, 0).
+        """
+        successes = np.asarray(successes, dtype=float)
+        trials = np.asarray(trials, dtype=float)
+        z = _z_score(confidence)
+        z2 = z * z
+        no_trials = trials == 0
+        n = np.where(no_trials, 1.0, trials)
+        p = successes / n
+        denom = 1 + z2 / n
+        center = (p + z2 / (2 * n)) / denom
+        margin = (z / denom) * np.sqrt(p * (1 - p) / n + z2 / (4 * n * n))
+        lo = np.where(no_trials, 0.0, np.maximum(0, center - margin))
+        hi = np.where(no_trials, 0.0, np.minimum(1, center + margin))
+        return np.stack((lo, hi), axis=-1)
     
     def run_analysis(self) -> Dict:
         """Run full analysis pipeline."""
@@ -736,8 +938,17 @@ class SpreadCalculator:
         return self.results
     
     def print_results(self):
-        """Print comprehensive results (directional only, no flat stats)."""
+        """Print comprehensive results (directional only, no flat stats).
+        
+        Lines are collected and written to stdout in a single call.
+        """
+        lines: List[str] = []
+        emit = lines.append
         df = self.df
+        levels = self.config.tick_levels
+        ts = self.config.tick_size
+        tick_edges = {n: n * ts for n in levels}
+        min_cond = self.config.min_conditional_samples
         emp = self.results.get('empirical', {})
         vol = self.results.get('vol_weighted', {})
         cond = self.results.get('conditional', {})
@@ -748,104 +959,104 @@ class SpreadCalculator:
         
         mode = "STRICT (Business Days)" if self.config.strict_daily_only else f"RELAXED (gap≤{self.config.max_days_gap})"
         
-        print(f"\n{'='*80}")
-        print("SPREAD STATISTICS")
-        print(f"{'='*80}")
-        print(f"Current: {df['spread_close'].iloc[-1]:.4f}")
-        print(f"Mean: {df['spread_close'].mean():.4f} | Std: {df['spread_close'].std():.4f}")
-        print(f"Range: [{df['spread_close'].min():.4f}, {df['spread_close'].max():.4f}]")
-        print(f"\nSpread Volume (min of legs): {df['spread_volume'].sum():,} total")
+        emit(f"\n{BAR}")
+        emit("SPREAD STATISTICS")
+        emit(BAR)
+        # NaN-aware NumPy reductions on the raw buffer (same skipna/ddof=1 semantics as pandas)
+        spread = df['spread_close'].to_numpy()
+        emit(f"Current: {spread[-1]:.4f}")
+        emit(f"Mean: {np.nanmean(spread):.4f} | Std: {np.nanstd(spread, ddof=1):.4f}")
+        emit(f"Range: [{np.nanmin(spread):.4f}, {np.nanmax(spread):.4f}]")
+        emit(f"\nSpread Volume (min of legs): {df['spread_volume'].sum():,} total")
         
-        self._print_histogram()
+        lines.extend(self._histogram_lines())
         
         # KEY LEVELS (Dynamic S/R with recency window)
         lookback = sr.get('lookback_days', 60)
-        print(f"\n{'='*80}")
-        print(f"KEY LEVELS (Last {lookback} Days)")
-        print(f"{'='*80}")
-        print(f"\nCurrent: {sr.get('current_price', 0):.4f} | Direction: {sr.get('direction', 'FLAT')}")
+        emit(f"\n{BAR}")
+        emit(f"KEY LEVELS (Last {lookback} Days)")
+        emit(BAR)
+        emit(f"\nCurrent: {sr.get('current_price', 0):.4f} | Direction: {sr.get('direction', 'FLAT')}")
         
         # Build actionable recommendation (presentation logic - moved from calculate_support_resistance)
         target = sr.get('next_target')
         if target:
-            target_dist = target['distance_ticks']
-            if target['strength'] >= 7:
-                action = f"Strong {target['type']} at {target['price']:.4f} ({target_dist}T away) - likely to hold"
-            elif target['strength'] >= 4:
-                action = f"Moderate {target['type']} at {target['price']:.4f} ({target_dist}T away) - watch for reaction"
-            else:
-                action = f"Weak level at {target['price']:.4f} ({target_dist}T away) - may break through"
+            strength_band = int(target['strength'] >= 4) + int(target['strength'] >= 7)
+            action = TARGET_ACTIONS[strength_band].format(
+                type=target['type'], price=target['price'], dist=target['distance_ticks']
+            )
         else:
             action = "No clear target in range"
         
-        print(f"\n🎯 TARGET: {action}")
+        emit(f"\n🎯 TARGET: {action}")
         
         # Format helper - generate proximity text here (presentation layer)
         def format_level(lv):
             dist_ticks = lv['distance_ticks']
             # Generate proximity text here (moved from calculate_support_resistance)
-            if dist_ticks <= 2:
-                prox = " ⚠️ TESTING"
-            elif dist_ticks <= 5:
-                prox = " → Approaching"
-            else:
-                prox = ""
+            prox = PROXIMITY_LABELS[int(dist_ticks <= 5) + int(dist_ticks <= 2)]
             return f"{lv['price']:.4f} │ Str:{lv['strength']:>4.1f} │ {dist_ticks:>2}T │ Touches:{lv['touches']:>3} │ {lv['type']}{prox}"
         
-        print(f"\n┌─ Resistance (Above) ─────────────────────────────────────────┐")
-        for i, level in enumerate(sr.get('resistance', []), 1):
-            print(f"│ R{i}: {format_level(level)}")
-        if not sr.get('resistance'):
-            print("│ None detected")
-        print("└" + "─"*62 + "┘")
+        resistance = sr.get('resistance', [])
+        support = sr.get('support', [])
         
-        print(f"\n┌─ Support (Below) ────────────────────────────────────────────┐")
-        for i, level in enumerate(sr.get('support', []), 1):
-            print(f"│ S{i}: {format_level(level)}")
-        if not sr.get('support'):
-            print("│ None detected")
-        print("└" + "─"*62 + "┘")
+        emit(f"\n┌─ Resistance (Above) ─────────────────────────────────────────┐")
+        for i, level in enumerate(resistance, 1):
+            emit(f"│ R{i}: {format_level(level)}")
+        if not resistance:
+            emit("│ None detected")
+        emit(BOX_BOT)
+        
+        emit(f"\n┌─ Support (Below) ────────────────────────────────────────────┐")
+        for i, level in enumerate(support, 1):
+            emit(f"│ S{i}: {format_level(level)}")
+        if not support:
+            emit("│ None detected")
+        emit(BOX_BOT)
         
         # DUAL-REGIME PROBABILITIES: Show both Raw (with spikes) and Filtered (normal)
-        print(f"\n{'='*80}")
-        print("TICK PROBABILITIES - DUAL REGIME COMPARISON")
-        print(f"{'='*80}")
+        emit(f"\n{BAR}")
+        emit("TICK PROBABILITIES - DUAL REGIME COMPARISON")
+        emit(BAR)
         
-        raw_results = self.results.get('empirical_raw', {})
-        filtered_results = self.results.get('empirical_filtered', {})
+        raw_results = self.results.get('empirical_raw') or {}
+        filtered_results = self.results.get('empirical_filtered') or {}
         
         n_raw = raw_results.get('n', 0)
         n_filtered = filtered_results.get('n', 0)
         n_outliers = self.results.get('n_outliers', 0)
         
-        print(f"\n{'':20} │ {'Real World (Inc. Spikes)':^26} │ {'Normal Regime (Filtered)':^26}")
-        print(f"{'':20} │ {'n=' + str(n_raw):^26} │ {'n=' + str(n_filtered) + ' (' + str(n_outliers) + ' outliers excl.)':^26}")
-        print("─" * 80)
+        emit(f"\n{'':20} │ {'Real World (Inc. Spikes)':^26} │ {'Normal Regime (Filtered)':^26}")
+        emit(f"{'':20} │ {'n=' + str(n_raw):^26} │ {'n=' + str(n_filtered) + ' (' + str(n_outliers) + ' outliers excl.)':^26}")
+        emit(RULE)
         
         raw_probs = raw_results.get('probs', {})
         filtered_probs = filtered_results.get('probs', emp)
         
-        for n in self.config.tick_levels:
-            if n not in filtered_probs:
-                continue
+        def regime_rows(n: int) -> List[str]:
             r = raw_probs.get(n, {})
-            f = filtered_probs.get(n, {})
-            
+            f = filtered_probs[n]
             r_at_least = r.get('prob_at_least', 0) * 100
             f_at_least = f.get('prob_at_least', 0) * 100
             delta = r_at_least - f_at_least
             delta_str = f"(+{delta:.1f}%)" if delta > 0.1 else ""
-            
-            print(f"\n{n} TICK (±{n * self.config.tick_size:.3f}):")
-            print(f"  P(≥{n} tick):         {r_at_least:>5.2f}% {delta_str:>10}      │ {f_at_least:>5.2f}%")
-            print(f"  P(UP≥{n}):            {r.get('prob_up_at_least', 0)*100:>5.2f}%                   │ {f.get('prob_up_at_least', 0)*100:>5.2f}%")
-            print(f"  P(DOWN≥{n}):          {r.get('prob_down_at_least', 0)*100:>5.2f}%                   │ {f.get('prob_down_at_least', 0)*100:>5.2f}%")
+            rows = [
+                f"\n{n} TICK (±{tick_edges[n]:.3f}):",
+                f"  P(≥{n} tick):         {r_at_least:>5.2f}% {delta_str:>10}      │ {f_at_least:>5.2f}%",
+                f"  P(UP≥{n}):            {r.get('prob_up_at_least', 0)*100:>5.2f}%                   │ {f.get('prob_up_at_least', 0)*100:>5.2f}%",
+                f"  P(DOWN≥{n}):          {r.get('prob_down_at_least', 0)*100:>5.2f}%                   │ {f.get('prob_down_at_least', 0)*100:>5.2f}%",
+            ]
             if n in vol:
-                print(f"  Vol-Wtd:           {vol[n]['vol_weighted_at_least']*100:>5.2f}%")
+                rows.append(f"  Vol-Wtd:           {vol[n]['vol_weighted_at_least']*100:>5.2f}%")
+            return rows
+        
+        for n in levels:
+            if n in filtered_probs:
+                lines.extend(regime_rows(n))
         
-        print(f"\n{'='*80}")
-        print(f"CONDITIONAL PROBABILITIES (min n={self.config.min_conditional_samples})")
-        print(f"{'='*80}")
+        emit(f"\n{BAR}")
+        emit(f"CONDITIONAL PROBABILITIES (min n={min_cond})")
+        emit(BAR)
         
         # RELATIVE BIAS + ACTIVITY METRIC for intuitive interpretation
         if 'after_up_move' in cond:
@@ -854,12 +1065,12 @@ class SpreadCalculator:
             activity = (p_up + p_down) * 100
             bias = p_down / (p_up + p_down) * 100 if (p_up + p_down) > 0 else 50
             activity_label = "High" if activity > 60 else "Medium" if activity > 30 else "Low"
-            print(f"\nAfter UP (n={c['n_samples']}):")
-            print(f"  Continue UP:  {p_up*100:5.1f}%")
-            print(f"  Reverse DOWN: {p_down*100:5.1f}%")
-            print(f"  → Bias: {bias:.0f}% reversal | Activity: {activity:.0f}% ({activity_label})")
+            emit(f"\nAfter UP (n={c['n_samples']}):")
+            emit(f"  Continue UP:  {p_up*100:5.1f}%")
+            emit(f"  Reverse DOWN: {p_down*100:5.1f}%")
+            emit(f"  → Bias: {bias:.0f}% reversal | Activity: {activity:.0f}% ({activity_label})")
         else:
-            print(f"\nAfter UP: Insufficient samples (<{self.config.min_conditional_samples})")
+            emit(f"\nAfter UP: Insufficient samples (<{min_cond})")
         
         if 'after_down_move' in cond:
             c = cond['after_down_move']
@@ -867,83 +1078,98 @@ class SpreadCalculator:
             activity = (p_up + p_down) * 100
             bias = p_up / (p_up + p_down) * 100 if (p_up + p_down) > 0 else 50
             activity_label = "High" if activity > 60 else "Medium" if activity > 30 else "Low"
-            print(f"\nAfter DOWN (n={c['n_samples']}):")
-            print(f"  Continue DOWN: {p_down*100:5.1f}%")
-            print(f"  Reverse UP:    {p_up*100:5.1f}%")
-            print(f"  → Bias: {bias:.0f}% reversal | Activity: {activity:.0f}% ({activity_label})")
+            emit(f"\nAfter DOWN (n={c['n_samples']}):")
+            emit(f"  Continue DOWN: {p_down*100:5.1f}%")
+            emit(f"  Reverse UP:    {p_up*100:5.1f}%")
+            emit(f"  → Bias: {bias:.0f}% reversal | Activity: {activity:.0f}% ({activity_label})")
         else:
-            print(f"\nAfter DOWN: Insufficient samples (<{self.config.min_conditional_samples})")
+            emit(f"\nAfter DOWN: Insufficient samples (<{min_cond})")
         
-        print(f"\n{'='*80}")
-        print("STATISTICAL ANALYSIS")
-        print(f"{'='*80}")
+        emit(f"\n{BAR}")
+        emit("STATISTICAL ANALYSIS")
+        emit(BAR)
         
         if 'distribution' in stat:
             d = stat['distribution']
-            print(f"\nDistribution:")
-            print(f"  Mean(abs): {d['mean_abs']:.3f} | Std: {d['std_abs']:.3f}")
-            print(f"  Skewness: {d['skewness']:.3f} | Kurtosis: {d['kurtosis']:.3f}")
+            emit(f"\nDistribution:")
+            emit(f"  Mean(abs): {d['mean_abs']:.3f} | Std: {d['std_abs']:.3f}")
+            emit(f"  Skewness: {d['skewness']:.3f} | Kurtosis: {d['kurtosis']:.3f}")
         
         if 'autocorrelation' in stat:
-            print(f"\nAutocorrelation:")
+            emit(f"\nAutocorrelation:")
             for k, v in stat['autocorrelation'].items():
                 if v is None:
-                    print(f"  {k}: N/A (zero variance)")
+                    emit(f"  {k}: N/A (zero variance)")
                 else:
-                    sig = '***' if abs(v) > 0.3 else '**' if abs(v) > 0.2 else '*' if abs(v) > 0.1 else ''
-                    print(f"  {k}: {v:+.4f} {sig}")
+                    mag = abs(float(v))
+                    sig = '***' if mag > 0.3 else '**' if mag > 0.2 else '*' if mag > 0.1 else ''
+                    emit(f"  {k}: {v:+.4f} {sig}")
         
         if 'wilcoxon' in stat:
             w = stat['wilcoxon']
-            if w['p_value'] is not None and not np.isnan(w['p_value']):
+            if w['p_value'] is not None and not math.isnan(w['p_value']):
                 bias = "Biased" if w['has_bias'] else "No bias"
-                print(f"\nWilcoxon (non-parametric): {bias} (p={w['p_value']:.4f})")
+                emit(f"\nWilcoxon (non-parametric): {bias} (p={w['p_value']:.4f})")
         
         if 'runs_test' in stat:
             rt = stat['runs_test']
             if rt['z_stat'] is not None:
-                print(f"Runs Test: {'Random' if rt['is_random'] else 'Non-random pattern'} (z={rt['z_stat']:.2f})")
+                emit(f"Runs Test: {'Random' if rt['is_random'] else 'Non-random pattern'} (z={rt['z_stat']:.2f})")
             elif rt.get('note'):
-                print(f"Runs Test: {rt['note']}")        
-        print(f"\n{'='*80}")
-        print("SUMMARY")
-        print(f"{'='*80}\n")
-        
-        print(f"{'Ticks':<6} {'P(≥N)':<10} {'P(UP)':<10} {'P(DOWN)':<10} {'Vol-Wtd':<10}")
-        print("-" * 50)
-        for n in self.config.tick_levels:
-            if n in emp:
-                e = emp[n]
+                emit(f"Runs Test: {rt['note']}")        
+        emit(f"\n{BAR}")
+        emit("SUMMARY")
+        emit(f"{BAR}\n")
+        
+        emit(f"{'Ticks':<6} {'P(≥N)':<10} {'P(UP)':<10} {'P(DOWN)':<10} {'Vol-Wtd':<10}")
+        emit(SUMMARY_RULE)
+        arr = self.results.get('empirical_arr') or {}
+        if arr:
+            p_ge, p_up, p_dn = arr['p_ge'] * 100, arr['p_up'] * 100, arr['p_dn'] * 100
+            for i, n in enumerate(arr['levels'].tolist()):
                 v = vol.get(n, {})
-                print(f"{n:<6} {e['prob_at_least']*100:>6.2f}%   {e['prob_up_at_least']*100:>6.2f}%   "
-                      f"{e['prob_down_at_least']*100:>6.2f}%   {v.get('vol_weighted_at_least', 0)*100:>6.2f}%")
+                emit(f"{n:<6} {p_ge[i]:>6.2f}%   {p_up[i]:>6.2f}%   "
+                     f"{p_dn[i]:>6.2f}%   {v.get('vol_weighted_at_least', 0)*100:>6.2f}%")
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
     
-    def _print_histogram(self):
-        """ASCII histogram of tick distribution."""
-        valid = self._get_valid_moves()
-        counter = Counter(valid['tick_move'].values)
+    def _histogram_lines(self) -> List[str]:
+        """ASCII histogram of tick distribution, as report lines."""
+        lines: List[str] = []
+        emit = lines.append
+        tick_moves = self._tick_move_valid
         
-        if not counter:
-            return
+        if len(tick_moves) == 0:
+            return lines
         
-        max_count = max(counter.values())
-        min_t, max_t = min(counter.keys()), max(counter.keys())
+        # Tick moves are small integers: bincount over the shifted range
+        min_t = int(tick_moves.min())
+        counts = np.bincount(tick_moves - min_t)
+        max_count = int(counts.max())
+        total = len(tick_moves)
         
         mode = "Strict Daily" if self.config.strict_daily_only else "Consecutive Days"
-        print(f"\n{'─'*60}")
-        print(f"TICK DISTRIBUTION ({mode})")
-        print(f"{'─'*60}")
-        
-        for t in range(int(min_t), int(max_t) + 1):
-            c = counter.get(t, 0)
-            bar_len = int((c / max_count) * 30) if max_count > 0 else 0
-            pct = 100 * c / len(valid)
+        emit(f"\n{HR}")
+        emit(f"TICK DISTRIBUTION ({mode})")
+        emit(HR)
+        
+        # Bar lengths and percentages for every bin at once
+        bar_lens = ((counts / max_count) * 30).astype(np.int64)
+        pcts = 100 * counts / total
+        
+        for t, c, bar_len, pct in zip(range(min_t, min_t + len(counts)), counts.tolist(),
+                                      bar_lens.tolist(), pcts.tolist()):
             char = '▓' if t > 0 else ('░' if t < 0 else '█')
-            print(f"  {t:+3d} │{'':1}{char * bar_len:<30} {c:4d} ({pct:4.1f}%)")
+            emit(f"  {t:+3d} │{'':1}{char * bar_len:<30} {c:4d} ({pct:4.1f}%)")
+        
+        return lines
 
 
 def resolve_path(filename: str, base_path: Path) -> Path:
-    """Resolve file path: CWD first, then script directory."""
+    """Resolve file path: absolute paths as-is, else CWD first, then script directory."""
+    if Path(filename).is_absolute():
+        return Path(filename)
+    
     # FIXED: Check CWD first for pipeline compatibility
     cwd_path = Path.cwd() / filename
     if cwd_path.exists():
@@ -958,8 +1184,10 @@ def resolve_path(filename: str, base_path: Path) -> Path:
     return cwd_path
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args() -> 'argparse.Namespace':
     """Parse command line arguments."""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Spread Probability Calculator - Production v8',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -976,7 +1204,7 @@ Examples:
     parser.add_argument('--strict', action='store_true', 
                         help='Strict business-day mode (gap=1 or Friday->Monday<=3)')
     parser.add_argument('--bootstrap-iter', type=int, default=2000, 
-                        help='Bootstrap iterations (default: 2000)')
+                        help='Bootstrap iterations (default: 2000, 0 = exact Binomial CI without sampling)')
     parser.add_argument('--no-dashboard', action='store_true', help='Skip dashboard generation')
     return parser.parse_args()
 
@@ -985,9 +1213,7 @@ def main() -> int:
     """Main entry point (fully automated)."""
     args = parse_args()
     
-    print("\n" + "="*80)
-    print("SPREAD PROBABILITY CALCULATOR (Production v8)")
-    print("="*80)
+    print(f"\n{BAR}\nSPREAD PROBABILITY CALCULATOR (Production v8)\n{BAR}")
     
     config = Config(
         tick_size=args.tick_size,
@@ -1012,8 +1238,8 @@ def main() -> int:
     if not args.file1 or not args.file2:
         print(f"Using defaults: {file1_name} / {file2_name}")
     
-    file1 = Path(file1_name) if Path(file1_name).is_absolute() else resolve_path(file1_name, base_path)
-    file2 = Path(file2_name) if Path(file2_name).is_absolute() else resolve_path(file2_name, base_path)
+    file1 = resolve_path(file1_name, base_path)
+    file2 = resolve_path(file2_name, base_path)
     
     if not file1.exists():
         print(f"❌ File not found: {file1}")
@@ -1027,16 +1253,14 @@ def main() -> int:
     calc.print_results()
     
     if not args.no_dashboard:
-        print(f"\n{'='*80}")
-        print("DASHBOARD")
-        print(f"{'='*80}")
+        print(f"\n{BAR}\nDASHBOARD\n{BAR}")
         
         try:
             from dashboard_generator import generate_dashboard
-            import webbrowser
             
             # FIXED: Output to CWD for user convenience
             dashboard_path = Path.cwd() / "spread_probability_dashboard.html"
+            valid = calc._get_valid_moves()
             generate_dashboard(
                 spread_df=calc.df,
                 empirical_probs=calc.results.get('empirical', {}),
@@ -1044,8 +1268,8 @@ def main() -> int:
                 bootstrap_results=calc.results.get('bootstrap', {}),
                 conditional_probs=calc.results.get('conditional', {}),
                 stat_tests=calc.results.get('stats', {}),
-                tick_moves=calc._get_valid_moves()['tick_move'].values,
-                abs_tick_moves=calc._get_valid_moves()['abs_tick_move'].values,
+                tick_moves=valid['tick_move'].values,
+                abs_tick_moves=valid['abs_tick_move'].values,
                 file1_name=file1.name,
                 file2_name=file2.name,
                 config={'tick_size': config.tick_size, 'tick_levels': list(config.tick_levels)},
@@ -1054,6 +1278,7 @@ def main() -> int:
                 empirical_raw=calc.results.get('empirical_raw', {}),
                 empirical_filtered=calc.results.get('empirical_filtered', {})
             )
+            import webbrowser
             print("🚀 Opening browser...")
             webbrowser.open(f'file://{dashboard_path.resolve()}')
         except ImportError: